@@ -8,10 +8,13 @@ from typing import Tuple, List, Optional
 from dataclasses import dataclass
 import threading
 import time
+from collections import deque
 
 @dataclass
 class PupilData:
     """瞳孔数据结构"""
+    __slots__ = ('center_x', 'center_y', 'radius', 'confidence', 'timestamp')
+    
     center_x: float
     center_y: float
     radius: float
@@ -21,6 +24,8 @@ class PupilData:
 @dataclass
 class GazePoint:
     """视线点数据结构"""
+    __slots__ = ('screen_x', 'screen_y', 'confidence', 'timestamp')
+    
     screen_x: float
     screen_y: float
     confidence: float
@@ -38,6 +43,25 @@ class EyeTrackingInterface:
         self.current_gaze_point = None
         self.calibration_data = []
         
+        # 模拟瞳孔偏移的预生成随机数缓冲区，避免每帧调用 np.random
+        self._rng_buf = np.random.randint(-50, 50, size=(4096, 2), dtype=np.int32)
+        self._rng_idx = 0
+        
+        # 采集与处理解耦：双缓冲帧槽，处理线程只取最新帧，旧帧直接丢弃
+        self._frame_bufs = [np.empty((480, 640, 3), dtype=np.uint8) for _ in range(2)]
+        self._active = 0
+        self._frame_seq = 0
+        self._processed_seq = 0
+        self._frame_cond = threading.Condition()
+        # 预处理输出缓冲区，避免每帧分配；检测在 1/_pre_scale 分辨率上进行
+        self._pre_scale = 2
+        self._gray = np.empty((480, 640), dtype=np.uint8)
+        self._gray_small = np.empty((240, 320), dtype=np.uint8)
+        
+        # 二阶多项式映射系数 (2, 6)，校准数据变化后在下一次视线估计时重新拟合
+        self._coefs: Optional[np.ndarray] = None
+        self._calib_dirty = True
+        
     def initialize_camera(self) -> bool:
         """
         初始化摄像头
@@ -52,16 +76,31 @@ class EyeTrackingInterface:
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
+            # 只缓存一帧，避免读到过时画面
+            if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                print("无法减小摄像头缓冲区大小")
+            
+            # 按摄像头实际分辨率预分配帧缓冲区
+            w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640
+            h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+            self._frame_bufs = [np.empty((h, w, 3), dtype=np.uint8) for _ in range(2)]
+            self._gray = np.empty((h, w), dtype=np.uint8)
+            self._gray_small = np.empty((h // self._pre_scale, w // self._pre_scale), dtype=np.uint8)
             
             return True
         except Exception as e:
             print(f"摄像头初始化失败: {e}")
             return False
     
-    def start_tracking(self):
-        """开始眼动追踪"""
+    def start_tracking(self, background_processing: bool = True):
+        """
+        开始眼动追踪
+        background_processing: 为 False 时只启动采集线程，由调用方（如界面的 QThread）循环调用 process_next_frame
+        """
         self.is_running = True
-        threading.Thread(target=self._tracking_loop, daemon=True).start()
+        threading.Thread(target=self._capture_loop, daemon=True).start()
+        if background_processing:
+            threading.Thread(target=self._tracking_loop, daemon=True).start()
     
     def stop_tracking(self):
         """停止眼动追踪"""
@@ -69,80 +108,170 @@ class EyeTrackingInterface:
         if self.cap:
             self.cap.release()
     
-    def _tracking_loop(self):
-        """追踪主循环（算法团队需要实现的核心逻辑）"""
+    def _capture_loop(self):
+        """采集循环：写入后台缓冲区后切换活动槽"""
+        # 采集线程连续读取，摄像头缓冲区不会积压过时帧；处理滞后时旧帧在槽中被直接覆盖
         while self.is_running and self.cap:
-            ret, frame = self.cap.read()
+            back = 1 - self._active
+            ret, frame = self.cap.read(self._frame_bufs[back])
             if not ret:
                 continue
-                
-            self.current_frame = frame
-            
-            # TODO: 算法团队实现的核心功能
-            # 1. 视频预处理
-            processed_frame = self._preprocess_frame(frame)
+            # 分辨率与预分配缓冲区不符时 OpenCV 会返回新数组
+            self._frame_bufs[back] = frame
             
-            # 2. 瞳孔检测
-            pupil_data = self._detect_pupil(processed_frame)
-            self.current_pupil_data = pupil_data
-            
-            # 3. 视线估计
-            if pupil_data and self.calibration_data:
-                gaze_point = self._estimate_gaze(pupil_data)
-                self.current_gaze_point = gaze_point
+            with self._frame_cond:
+                self._active = back
+                self._frame_seq += 1
+                self._frame_cond.notify()
+    
+    def _tracking_loop(self):
+        """追踪主循环"""
+        while self.is_running:
+            self.process_next_frame()
+    
+    def process_next_frame(self, timeout: float = 0.1) -> bool:
+        """
+        等待并处理最新一帧（算法团队需要实现的核心逻辑）
+        返回: 超时前是否处理了新帧
+        """
+        # 等待新帧，取活动槽中的最新一帧
+        with self._frame_cond:
+            if self._frame_seq == self._processed_seq:
+                self._frame_cond.wait(timeout=timeout)
+            if self._frame_seq == self._processed_seq:
+                return False
+            self._processed_seq = self._frame_seq
+            # 锁内复制，采集线程随后会覆写另一缓冲区
+            frame = self._frame_bufs[self._active].copy()
             
-            time.sleep(1/30)  # 30 FPS
+        self.current_frame = frame
+        # 每帧只取一次时间戳，瞳孔数据与视线点共用
+        now = time.time()
+        
+        # TODO: 算法团队实现的核心功能
+        # 1. 视频预处理
+        processed_frame = self._preprocess_frame(frame)
+        
+        # 2. 瞳孔检测
+        pupil_data = self._detect_pupil(processed_frame, now)
+        self.current_pupil_data = pupil_data
+        
+        # 3. 视线估计
+        if pupil_data and self.calibration_data:
+            gaze_point = self._estimate_gaze(pupil_data, now)
+            self.current_gaze_point = gaze_point
+        
+        return True
     
     def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
         """
         视频预处理 - 算法团队需要实现
         当前为模拟实现
         """
-        # 转灰度
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # 转灰度（OpenCV 默认启用优化，内部按 CPU 特性分派 AVX2/NEON 实现）
+        h, w = frame.shape[:2]
+        if self._gray.shape != (h, w):
+            self._gray = np.empty((h, w), dtype=np.uint8)
+            self._gray_small = np.empty((h // self._pre_scale, w // self._pre_scale), dtype=np.uint8)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        # 面积插值缩小（整数倍时 OpenCV 走快速块平均路径），瞳孔检测只需处理 1/4 像素
+        small_h, small_w = self._gray_small.shape
+        small = cv2.resize(gray, (small_w, small_h), dst=self._gray_small, interpolation=cv2.INTER_AREA)
         # TODO: 算法团队添加更多预处理步骤
-        return gray
+        return small
     
-    def _detect_pupil(self, frame: np.ndarray) -> Optional[PupilData]:
+    def _detect_pupil(self, frame: np.ndarray, now: Optional[float] = None) -> Optional[PupilData]:
         """
         瞳孔检测算法 - 算法团队需要实现
         当前为模拟实现，返回屏幕中心位置
         """
         # TODO: 算法团队实现真正的瞳孔检测
         # 当前模拟返回随机瞳孔位置
+        # 输入为缩小后的灰度图，输出坐标换算回原始分辨率
         height, width = frame.shape
-        center_x = width // 2 + np.random.randint(-50, 50)
-        center_y = height // 2 + np.random.randint(-50, 50)
+        dx, dy = self._rng_buf[self._rng_idx]
+        self._rng_idx = (self._rng_idx + 1) & 4095
+        center_x = width * self._pre_scale // 2 + int(dx)
+        center_y = height * self._pre_scale // 2 + int(dy)
         
         return PupilData(
             center_x=center_x,
             center_y=center_y,
             radius=15.0,
             confidence=0.85,
-            timestamp=time.time()
+            timestamp=time.time() if now is None else now
         )
     
-    def _estimate_gaze(self, pupil_data: PupilData) -> Optional[GazePoint]:
+    def _estimate_gaze(self, pupil_data: PupilData, now: Optional[float] = None) -> Optional[GazePoint]:
         """
         视线估计算法 - 算法团队需要实现
         当前为模拟实现
         """
         # TODO: 算法团队实现视线估计算法
-        # 当前简单映射到屏幕坐标
+        # 当前使用校准点拟合的二阶多项式映射到屏幕坐标
         if not pupil_data:
             return None
             
-        # 模拟屏幕坐标映射
-        screen_x = pupil_data.center_x * 3  # 简单缩放
-        screen_y = pupil_data.center_y * 2.5
+        if self._calib_dirty:
+            self._fit_calibration()
+            
+        coefs = self._coefs
+        if coefs is None:
+            # 校准点不足时使用模拟映射
+            screen_x = pupil_data.center_x * 3  # 简单缩放
+            screen_y = pupil_data.center_y * 2.5
+        else:
+            vec = self._poly_features(np.float32(pupil_data.center_x), np.float32(pupil_data.center_y))
+            screen_x, screen_y = (coefs @ vec).tolist()
         
         return GazePoint(
             screen_x=screen_x,
             screen_y=screen_y,
             confidence=pupil_data.confidence,
-            timestamp=pupil_data.timestamp
+            timestamp=pupil_data.timestamp if now is None else now
         )
     
+    @staticmethod
+    def _poly_features(px, py) -> np.ndarray:
+        """构造多项式特征 [px, py, px*py, px^2, py^2, 1]，支持标量或一维数组"""
+        return np.stack([px, py, px * py, px * px, py * py, np.ones_like(px)], axis=-1)
+    
+    def estimate_gaze_batch(self, pupil_points: np.ndarray) -> Optional[np.ndarray]:
+        """
+        批量视线估计，用于回放或离线评估
+        pupil_points: (N, 2) 瞳孔坐标
+        返回: (N, 2) 屏幕坐标，未完成校准时返回 None
+        """
+        if self._calib_dirty:
+            self._fit_calibration()
+        coefs = self._coefs
+        if coefs is None:
+            return None
+            
+        pts = np.asarray(pupil_points, dtype=np.float32)
+        return self._poly_features(pts[:, 0], pts[:, 1]) @ coefs.T
+    
+    def _fit_calibration(self):
+        """
+        拟合二阶多项式映射：
+        screen = a0*px + a1*py + a2*px*py + a3*px^2 + a4*py^2 + a5
+        """
+        # 先清除标记，拟合期间新增的校准点会再次置位
+        self._calib_dirty = False
+        data = list(self.calibration_data)
+        if len(data) < 6:
+            self._coefs = None
+            return
+            
+        px = np.array([d['pupil_x'] for d in data], dtype=np.float64)
+        py = np.array([d['pupil_y'] for d in data], dtype=np.float64)
+        sx = np.array([d['screen_x'] for d in data], dtype=np.float64)
+        sy = np.array([d['screen_y'] for d in data], dtype=np.float64)
+        
+        M = self._poly_features(px, py)
+        coefs = np.linalg.lstsq(M, np.stack([sx, sy], axis=1), rcond=None)[0]
+        self._coefs = coefs.T.astype(np.float32)
+    
     def add_calibration_point(self, screen_x: float, screen_y: float, pupil_x: float, pupil_y: float):
         """
         添加校准点 - 算法团队需要实现校准算法
@@ -154,10 +283,12 @@ class EyeTrackingInterface:
             'pupil_y': pupil_y,
             'timestamp': time.time()
         })
+        self._calib_dirty = True
     
     def clear_calibration(self):
         """清除校准数据"""
         self.calibration_data.clear()
+        self._calib_dirty = True
     
     def get_current_frame(self) -> Optional[np.ndarray]:
         """获取当前帧"""
@@ -171,6 +302,27 @@ class EyeTrackingInterface:
         """获取当前视线点"""
         return self.current_gaze_point
 
+def _find_region_loop(bounds: np.ndarray, x: float, y: float) -> int:
+    """逐个检查包围盒 [x1, y1, x2, y2]，返回第一个包含该点的索引，未命中返回 -1"""
+    for i in range(bounds.shape[0]):
+        if bounds[i, 0] <= x <= bounds[i, 2] and bounds[i, 1] <= y <= bounds[i, 3]:
+            return i
+    return -1
+
+_find_region_jit = None  # numba 编译后的 _find_region_loop；未安装 numba 时为 False
+
+def _get_find_region_jit():
+    """首次调用时导入 numba 并编译（由 set_regions 预先触发），未安装 numba 时返回 False"""
+    global _find_region_jit
+    if _find_region_jit is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _find_region_jit = False
+        else:
+            _find_region_jit = njit(cache=True)(_find_region_loop)
+    return _find_region_jit
+
 class RegionManager:
     """区域管理类 - 处理屏幕区域划分和判定"""
     
@@ -179,9 +331,20 @@ class RegionManager:
         self.screen_height = screen_height
         self.rows = rows
         self.cols = cols
-        self.regions = self._create_regions()
+        self._rw = screen_width / cols
+        self._rh = screen_height / rows
+        regions = self._create_regions()
+        bounds = self._index_regions(regions)
+        self.regions = regions
+        # 判定所需状态打包为 (是否均匀网格, 区域列表, 包围盒) 整体替换，追踪线程每次判定只读取一次，
+        # 不会看到新旧布局混杂的状态；均匀网格可直接按行列计算索引，自定义布局改用包围盒判定
+        self._layout = (True, regions, bounds)
+        self.layout_version = 0  # 每次 set_regions 递增，供界面判断是否需要重建缓存
         self.current_region = None
-        self.region_history = []
+        self.current_region_id: Optional[int] = None
+        self._last: Optional[dict] = None  # 最近一次命中的区域
+        # 限定历史长度，避免长时间运行时内存无限增长
+        self.region_history: deque = deque(maxlen=4096)
     
     def _create_regions(self) -> List[dict]:
         """创建屏幕区域"""
@@ -205,22 +368,100 @@ class RegionManager:
         
         return regions
     
+    def _index_regions(self, regions: List[dict]) -> np.ndarray:
+        """根据区域列表重建按列存储的几何数据，返回各区域包围盒"""
+        # 按列存储的区域几何（SoA），供批量缩放和绘制使用
+        self.ids = np.array([r['id'] for r in regions], dtype=np.int32)
+        self.names = [r['name'] for r in regions]
+        self.xs = np.array([r['x'] for r in regions], dtype=np.float64)
+        self.ys = np.array([r['y'] for r in regions], dtype=np.float64)
+        self.ws = np.array([r['width'] for r in regions], dtype=np.float64)
+        self.hs = np.array([r['height'] for r in regions], dtype=np.float64)
+        
+        # 各区域包围盒 [x1, y1, x2, y2]，供非均匀布局的判定使用
+        return np.column_stack([self.xs, self.ys, self.xs + self.ws, self.ys + self.hs])
+    
+    def set_regions(self, regions: List[dict]):
+        """
+        设置自定义（可非均匀）的区域布局
+        regions: 每项至少包含 x, y, width, height，可选 name；id 按顺序重新编号
+        RegionGridWidget 会根据 layout_version 在下次绘制时重建区域缓存
+        """
+        new_regions = []
+        for i, r in enumerate(regions):
+            new_regions.append({
+                'id': i,
+                'name': r.get('name', f'区域_{i+1}'),
+                'x': r['x'],
+                'y': r['y'],
+                'width': r['width'],
+                'height': r['height'],
+                'center_x': r['x'] + r['width'] / 2,
+                'center_y': r['y'] + r['height'] / 2
+            })
+        
+        bounds = self._index_regions(new_regions)
+        # 在此预先导入 numba 并编译判定函数，避免首次判定时在追踪线程中卡顿
+        find_region = _get_find_region_jit()
+        if find_region:
+            find_region(bounds, 0.0, 0.0)
+        # 新布局完整构建后再一次性发布
+        self._layout = (False, new_regions, bounds)
+        self.regions = new_regions
+        self.layout_version += 1
+        self._last = None
+        self.current_region = None
+        self.current_region_id = None
+    
     def get_region_by_point(self, x: float, y: float) -> Optional[dict]:
         """根据坐标点获取所属区域"""
-        for region in self.regions:
-            if (region['x'] <= x <= region['x'] + region['width'] and
-                region['y'] <= y <= region['y'] + region['height']):
-                return region
-        return None
-    
-    def update_current_region(self, x: float, y: float):
-        """更新当前区域"""
-        new_region = self.get_region_by_point(x, y)
-        if new_region != self.current_region:
+        uniform, regions, bounds = self._layout
+        if not uniform:
+            idx = self._find_region_index(bounds, x, y)
+            return regions[idx] if idx >= 0 else None
+            
+        # 相邻视线点通常落在同一区域，先检查上次命中的区域
+        r = self._last
+        if r is not None and r['x'] <= x < r['x'] + r['width'] and r['y'] <= y < r['y'] + r['height']:
+            return r
+            
+        # 均匀网格，直接按行列计算索引
+        if not (0 <= x <= self.screen_width and 0 <= y <= self.screen_height):
+            return None
+        # 右/下边界上的点归入最后一列/行
+        col = min(int(x / self._rw), self.cols - 1)
+        row = min(int(y / self._rh), self.rows - 1)
+        region = regions[row * self.cols + col]
+        self._last = region
+        return region
+    
+    def _find_region_index(self, bounds: np.ndarray, x: float, y: float) -> int:
+        """对所有包围盒做判定，返回第一个包含该点的区域索引，未命中返回 -1"""
+        # 安装了 numba 时使用编译后的循环，否则使用 NumPy 向量化判定
+        find_region = _get_find_region_jit()
+        if find_region:
+            return int(find_region(bounds, float(x), float(y)))
+            
+        b = bounds
+        mask = (x >= b[:, 0]) & (x <= b[:, 2]) & (y >= b[:, 1]) & (y <= b[:, 3])
+        if not mask.any():
+            return -1
+        return int(np.argmax(mask))
+    
+    def update_current_region(self, x: float, y: float, timestamp: Optional[float] = None):
+        """更新当前区域，timestamp 通常传入视线点的时间戳"""
+        self.set_current_region(self.get_region_by_point(x, y), timestamp)
+    
+    def set_current_region(self, new_region: Optional[dict], timestamp: Optional[float] = None):
+        """设置已判定好的当前区域（如追踪线程已计算出的区域），变化时记录历史"""
+        # 只比较区域 id，避免逐键比较字典
+        new_id = None if new_region is None else new_region['id']
+        if new_id != self.current_region_id:
+            self.current_region_id = new_id
             self.current_region = new_region
             self.region_history.append({
                 'region': new_region,
-                'timestamp': time.time()
+                'timestamp': time.time() if timestamp is None else timestamp
             })
     
     def get_regions(self) -> List[dict]:
@@ -3,11 +3,12 @@ Eye Touch 交互测试模块
 提供各种交互测试场景来验证眼动追踪算法
 """
 import time
-import random
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QProgressBar, QGridLayout)
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPropertyAnimation, QRect
@@ -17,7 +18,7 @@ from qfluentwidgets import (CardWidget, BodyLabel, CaptionLabel,
                           PrimaryPushButton, PushButton, InfoBar, 
                           InfoBarPosition)
 
-from algorithm_interface import GazePoint
+from algorithm_interface import GazePoint, RegionManager
 
 class TestType(Enum):
     """测试类型枚举"""
@@ -50,6 +51,7 @@ class RegionDwellTest(QWidget):
         self.dwell_start_time = None
         self.is_in_target = False
         self.test_active = False
+        self._last_progress_value = 0
         
         self.init_ui()
         
@@ -75,7 +77,7 @@ class RegionDwellTest(QWidget):
         
         self.setLayout(layout)
         
-        # 更新定时器
+        # 更新定时器：没有视线样本（如追踪已停止）时也能推进进度并检查超时
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_progress)
         
@@ -84,7 +86,7 @@ class RegionDwellTest(QWidget):
         self.test_active = True
         self.start_time = time.time()
         self.status_label.setText("测试进行中...")
-        self.update_timer.start(10)  # 10ms 更新一次
+        self.update_timer.start(33)  # 与视线更新频率一致
         
     def stop_test(self):
         """停止测试"""
@@ -112,24 +114,34 @@ class RegionDwellTest(QWidget):
             self.dwell_start_time = None
             self.status_label.setText("❌ 离开目标区域，请重新注视")
             self.progress_bar.setValue(0)
+            self._last_progress_value = 0
             
     def update_progress(self):
         """更新进度"""
         if not self.test_active:
             return
             
-        if self.is_in_target and self.dwell_start_time:
-            elapsed = time.time() - self.dwell_start_time
-            progress = min(elapsed / self.dwell_time, 1.0)
-            self.progress_bar.setValue(int(progress * self.progress_bar.maximum()))
-            
-            if progress >= 1.0:
-                # 测试完成
-                self.complete_test(True)
+        now = time.time()
         
         # 检查超时
-        if self.start_time and (time.time() - self.start_time) > 30:  # 30秒超时
+        if self.start_time and (now - self.start_time) > 30:  # 30秒超时
             self.complete_test(False)
+            return
+            
+        if not (self.is_in_target and self.dwell_start_time):
+            return
+            
+        elapsed = now - self.dwell_start_time
+        progress = min(elapsed / self.dwell_time, 1.0)
+        # 仅在数值变化时刷新进度条，避免重复重绘
+        value = int(progress * self.progress_bar.maximum())
+        if value != self._last_progress_value:
+            self._last_progress_value = value
+            self.progress_bar.setValue(value)
+        
+        if progress >= 1.0:
+            # 测试完成
+            self.complete_test(True)
             
     def complete_test(self, success: bool):
         """完成测试"""
@@ -156,10 +168,12 @@ class TargetSelectionTest(QWidget):
     
     test_completed = pyqtSignal(TestResult)
     
-    def __init__(self, regions: List[Dict], num_targets: int = 5):
+    def __init__(self, regions: List[Dict], num_targets: int = 5,
+                 rng: Optional[np.random.Generator] = None):
         super().__init__()
         self.regions = regions
         self.num_targets = num_targets
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.current_target_index = 0
         self.target_sequence = []
         self.selected_regions = []
@@ -193,7 +207,8 @@ class TargetSelectionTest(QWidget):
         
     def generate_target_sequence(self):
         """生成目标序列"""
-        self.target_sequence = random.sample(self.regions, min(self.num_targets, len(self.regions)))
+        idx = self.rng.choice(len(self.regions), size=min(self.num_targets, len(self.regions)), replace=False)
+        self.target_sequence = [self.regions[i] for i in idx]
         
     def start_test(self):
         """开始测试"""
@@ -258,44 +273,96 @@ class TargetSelectionTest(QWidget):
 class InteractionTestManager:
     """交互测试管理器"""
     
-    def __init__(self, regions: List[Dict]):
-        self.regions = regions
+    def __init__(self, region_manager: RegionManager, seed: Optional[int] = None):
+        self.region_manager = region_manager
+        self.regions = region_manager.get_regions()
         self.test_results = []
         self.current_test = None
+        # 订阅视线更新的测试回调，区域判定每个视线点只做一次
+        self._subscribers: List[Callable[[Optional[GazePoint], Optional[Dict]], None]] = []
+        # 统一的随机数生成器，指定 seed 可复现测试序列
+        self._rng = np.random.default_rng(seed)
+        
+        # 按列存储的结果数据，用于向量化统计，容量不足时倍增
+        self._succ = np.zeros(1024, dtype=np.bool_)
+        self._dur = np.zeros(1024, dtype=np.float64)
+        self._acc = np.zeros(1024, dtype=np.float64)
+        self._ts = np.zeros(1024, dtype=np.float64)
+        self._n = 0
         
     def create_region_dwell_test(self, target_region: Dict, dwell_time: float = 2.0) -> RegionDwellTest:
         """创建区域停留测试"""
         test = RegionDwellTest(target_region, dwell_time)
         test.test_completed.connect(self.on_test_completed)
+        self.register_test(test)
         return test
         
     def create_target_selection_test(self, num_targets: int = 5) -> TargetSelectionTest:
         """创建目标选择测试"""
-        test = TargetSelectionTest(self.regions, num_targets)
+        test = TargetSelectionTest(self.regions, num_targets, self._rng)
         test.test_completed.connect(self.on_test_completed)
+        self.register_test(test)
         return test
         
+    def register_test(self, test):
+        """
+        注册测试的视线回调
+        测试完成后仍保持订阅（未进行时 update_gaze_point 直接返回），
+        以便 start_test() 重新开始后继续接收视线；控件销毁时自动注销
+        """
+        callback = test.update_gaze_point
+        self._subscribers.append(callback)
+        test.destroyed.connect(lambda _obj=None, cb=callback: self._remove_subscriber(cb))
+        
+    def unregister_test(self, test):
+        """注销测试的视线回调"""
+        self._remove_subscriber(test.update_gaze_point)
+        
+    def _remove_subscriber(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+        
+    def on_gaze(self, gaze_point: Optional[GazePoint], current_region: Optional[Dict] = None):
+        """
+        分发视线点：统一计算所在区域后通知所有已注册的测试
+        可直接连接 TrackingWorker.gaze_updated，复用其已计算的区域
+        """
+        if current_region is None and gaze_point is not None:
+            current_region = self.region_manager.get_region_by_point(gaze_point.screen_x, gaze_point.screen_y)
+        for subscriber in list(self._subscribers):
+            subscriber(gaze_point, current_region)
+        
     def on_test_completed(self, result: TestResult):
         """测试完成处理"""
         self.test_results.append(result)
+        
+        if self._n == len(self._succ):
+            capacity = 2 * len(self._succ)
+            self._succ = np.resize(self._succ, capacity)
+            self._dur = np.resize(self._dur, capacity)
+            self._acc = np.resize(self._acc, capacity)
+            self._ts = np.resize(self._ts, capacity)
+        self._succ[self._n] = result.success
+        self._dur[self._n] = result.duration
+        self._acc[self._n] = result.accuracy
+        self._ts[self._n] = result.timestamp
+        self._n += 1
+        
         print(f"测试完成: {result.test_type.value}")
         print(f"成功: {result.success}, 准确率: {result.accuracy:.2%}, 耗时: {result.duration:.2f}秒")
         
     def get_test_statistics(self) -> Dict:
         """获取测试统计信息"""
-        if not self.test_results:
+        if not self._n:
             return {}
             
-        total_tests = len(self.test_results)
-        successful_tests = sum(1 for r in self.test_results if r.success)
-        avg_accuracy = sum(r.accuracy for r in self.test_results) / total_tests
-        avg_duration = sum(r.duration for r in self.test_results) / total_tests
+        n = self._n
         
         return {
-            'total_tests': total_tests,
-            'success_rate': successful_tests / total_tests,
-            'average_accuracy': avg_accuracy,
-            'average_duration': avg_duration,
+            'total_tests': n,
+            'success_rate': float(self._succ[:n].mean()),
+            'average_accuracy': float(self._acc[:n].mean()),
+            'average_duration': float(self._dur[:n].mean()),
             'results': self.test_results
         }
         
@@ -303,18 +370,18 @@ class InteractionTestManager:
         """导出测试结果到CSV文件"""
         import csv
         
+        n = self._n
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['test_type', 'success', 'duration', 'accuracy', 'timestamp']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
-            writer.writeheader()
-            for result in self.test_results:
-                writer.writerow({
-                    'test_type': result.test_type.value,
-                    'success': result.success,
-                    'duration': result.duration,
-                    'accuracy': result.accuracy,
-                    'timestamp': result.timestamp
-                })
+            writer.writerow(['test_type', 'success', 'duration', 'accuracy', 'timestamp'])
+            # 按列一次性写出
+            writer.writerows(zip(
+                [r.test_type.value for r in self.test_results],
+                self._succ[:n].tolist(),
+                self._dur[:n].tolist(),
+                self._acc[:n].tolist(),
+                self._ts[:n].tolist()
+            ))
         
         print(f"测试结果已导出到: {filename}")
@@ -4,15 +4,18 @@ Eye Touch 主程序窗口
 """
 import sys
 import configparser
-from typing import Optional
+import functools
+import time
+from collections import deque
+from typing import Optional, Tuple
 import numpy as np
 import cv2
 
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, 
                            QHBoxLayout, QGridLayout, QLabel, QPushButton, 
                            QFrame, QSplitter, QTextEdit, QGroupBox)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, pyqtSlot
-from PyQt6.QtGui import QFont, QPixmap, QImage, QPainter, QPen, QBrush, QColor, QKeyEvent
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, pyqtSlot, QRect
+from PyQt6.QtGui import QFont, QPixmap, QImage, QPainter, QPen, QBrush, QColor, QKeyEvent, QTextCursor
 
 from qfluentwidgets import (FluentWindow, FluentIcon, InfoBar, InfoBarPosition, setTheme, Theme,
                           PrimaryPushButton, PushButton, ToggleButton, CardWidget,
@@ -20,12 +23,94 @@ from qfluentwidgets import (FluentWindow, FluentIcon, InfoBar, InfoBarPosition,
 
 from algorithm_interface import EyeTrackingInterface, RegionManager, GazePoint
 
+@functools.lru_cache(maxsize=1)
+def _load_config() -> configparser.ConfigParser:
+    """加载配置文件（只读取一次，重复创建主窗口时复用）"""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+    return config
+
+class TrackingWorker(QThread):
+    """追踪处理线程：逐帧处理并通过信号推送视线点及所在区域"""
+    
+    gaze_updated = pyqtSignal(object, object)  # (GazePoint 或 None, 区域 dict 或 None)
+    frame_ready = pyqtSignal(object, object, object)  # (可直接显示的 QImage, 其底层 BGRA 数组, GazePoint 或 None)
+    
+    def __init__(self, eye_tracker: EyeTrackingInterface, region_manager: RegionManager):
+        super().__init__()
+        self.eye_tracker = eye_tracker
+        self.region_manager = region_manager
+        # 上一帧尚未被界面取走时不再推送新帧，避免信号在事件队列中堆积
+        self._frame_pending = False
+        # 摄像头预览所在页面不可见时跳过颜色转换和帧推送
+        self.display_enabled = True
+        
+    def prepare_image(self, frame: np.ndarray) -> Tuple[QImage, np.ndarray]:
+        """在追踪线程中完成颜色转换并包装为 QImage，界面线程只需生成 pixmap"""
+        # 每帧转换到新分配的 BGRA 数组（alpha 恒为 255），该数组只属于这一帧，不会被后续帧覆写
+        height, width = frame.shape[:2]
+        bgra = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+        
+        # 小端序下 BGRA 字节即 Qt 的 ARGB32，使用 Qt 绘制的原生格式可免去每次绘制时的格式转换；
+        # QImage 直接包装 bgra 的内存（不复制），调用方需与 QImage 一起持有 bgra
+        q_image = QImage(bgra.data, width, height, 4 * width, QImage.Format.Format_ARGB32_Premultiplied)
+        return q_image, bgra
+        
+    def frame_consumed(self):
+        """界面处理完一帧后调用，允许推送下一帧"""
+        self._frame_pending = False
+        
+    def run(self):
+        """处理循环，直到请求中断"""
+        self._frame_pending = False
+        while not self.isInterruptionRequested():
+            if not self.eye_tracker.process_next_frame():
+                continue
+                
+            gaze_point = self.eye_tracker.get_current_gaze_point()
+            current_region = None
+            if gaze_point:
+                current_region = self.region_manager.get_region_by_point(gaze_point.screen_x, gaze_point.screen_y)
+            self.gaze_updated.emit(gaze_point, current_region)
+            
+            frame = self.eye_tracker.get_current_frame()
+            if frame is not None and self.display_enabled and not self._frame_pending:
+                self._frame_pending = True
+                # 数组随信号一同传递，保证界面线程使用 QImage 期间底层内存有效
+                q_image, bgra = self.prepare_image(frame)
+                self.frame_ready.emit(q_image, bgra, gaze_point)
+
+class GazeOverlay(QWidget):
+    """叠加在摄像头画面上的视线点标记，避免每帧在图像上重绘"""
+    
+    SIZE = 24  # 20px 圆 + 3px 画笔留白
+    
+    def __init__(self, parent: QWidget):
+        super().__init__(parent)
+        self.setFixedSize(self.SIZE, self.SIZE)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self._pen = QPen(QColor(255, 0, 0), 3)
+        self.hide()
+        
+    def paintEvent(self, event):
+        """绘制视线点"""
+        painter = QPainter(self)
+        painter.setPen(self._pen)
+        offset = (self.SIZE - 20) // 2
+        painter.drawEllipse(offset, offset, 20, 20)
+
 class CameraWidget(QLabel):
     """摄像头显示组件"""
     
+    FRAME_WIDTH = 640   # 与摄像头采集分辨率一致
+    FRAME_HEIGHT = 480
+    BORDER = 2          # 与样式表中的边框宽度一致
+    
     def __init__(self):
         super().__init__()
-        self.setFixedSize(640, 480)
+        # 边框占去的尺寸计入组件大小，使内容区域正好等于采集分辨率，默认分辨率下无需每帧缩放
+        self.setFixedSize(self.FRAME_WIDTH + 2 * self.BORDER, self.FRAME_HEIGHT + 2 * self.BORDER)
         self.setStyleSheet("""
             QLabel {
                 border: 2px solid #ddd;
@@ -35,34 +120,33 @@ class CameraWidget(QLabel):
         """)
         self.setText("摄像头未启动")
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._gaze_overlay = GazeOverlay(self)
         
-    def update_frame(self, frame: np.ndarray, gaze_point: Optional[GazePoint] = None):
-        """更新显示帧"""
-        if frame is None:
+    def update_frame(self, q_image: QImage, gaze_point: Optional[GazePoint] = None):
+        """更新显示帧（颜色转换已在追踪线程中完成）"""
+        if q_image is None or not self.isVisible():
             return
             
-        # 转换为 RGB 格式
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        height, width, channel = rgb_frame.shape
-        bytes_per_line = 3 * width
-        
-        # 创建 QImage
-        q_image = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-        
-        # 在图像上绘制视线点
-        if gaze_point:
-            painter = QPainter(q_image)
-            pen = QPen(QColor(255, 0, 0), 3)
-            painter.setPen(pen)
-            painter.drawEllipse(int(gaze_point.screen_x - 10), 
-                              int(gaze_point.screen_y - 10), 20, 20)
-            painter.end()
-        
-        # 缩放到组件大小
+        # 注意保持使用 QPixmap.fromImage：QPixmap(q_image) 在 Python 绑定中为模拟实现，速度明显更慢。
+        # 不要传 NoFormatConversion：该标志会让 pixmap 直接共享 QImage 的内存而不复制
         pixmap = QPixmap.fromImage(q_image)
-        scaled_pixmap = pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, 
-                                    Qt.TransformationMode.SmoothTransformation)
-        self.setPixmap(scaled_pixmap)
+        rect = self.contentsRect()
+        if pixmap.size() != rect.size():
+            # 保持宽高比缩放到显示区域（边框会占去部分尺寸），居中对齐后两侧留白
+            pixmap = pixmap.scaled(rect.size(), Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.FastTransformation)
+        self.setPixmap(pixmap)
+        
+        # 移动视线点标记，图像坐标按实际显示的画面位置和比例换算
+        if gaze_point:
+            scale = pixmap.width() / q_image.width()
+            gaze_x = rect.x() + (rect.width() - pixmap.width()) / 2 + gaze_point.screen_x * scale
+            gaze_y = rect.y() + (rect.height() - pixmap.height()) / 2 + gaze_point.screen_y * scale
+            half = GazeOverlay.SIZE // 2
+            self._gaze_overlay.move(int(gaze_x) - half, int(gaze_y) - half)
+            self._gaze_overlay.show()
+        else:
+            self._gaze_overlay.hide()
 
 class RegionGridWidget(QWidget):
     """区域网格显示组件"""
@@ -76,6 +160,7 @@ class RegionGridWidget(QWidget):
         self.current_gaze_point = None
         self.setFixedSize(600, 400)
         self.init_ui()
+        self.update_scaled_rects()
         
     def init_ui(self):
         """初始化界面"""
@@ -87,19 +172,32 @@ class RegionGridWidget(QWidget):
             }
         """)
         
-    def update_gaze_point(self, gaze_point: Optional[GazePoint]):
-        """更新视线点"""
+        # 绘制样式只创建一次，避免每次绘制重复构造
+        self._normal_brush = QBrush(QColor(240, 240, 240, 50))
+        self._normal_pen = QPen(QColor(200, 200, 200), 1)
+        self._current_brush = QBrush(QColor(0, 123, 255, 100))
+        self._current_pen = QPen(QColor(0, 123, 255), 3)
+        self._label_pen = QPen(QColor(100, 100, 100))
+        self._gaze_brush = QBrush(QColor(255, 0, 0))
+        self._gaze_pen = QPen(QColor(255, 0, 0), 2)
+        
+    def update_gaze_point(self, gaze_point: Optional[GazePoint], current_region: Optional[dict] = None):
+        """更新视线点，current_region 为追踪线程已判定的区域时直接复用"""
         if gaze_point != self.current_gaze_point:
             self.current_gaze_point = gaze_point
             
             if gaze_point:
                 # 更新当前区域
                 old_region = self.region_manager.get_current_region()
-                self.region_manager.update_current_region(gaze_point.screen_x, gaze_point.screen_y)
+                if current_region is None:
+                    self.region_manager.update_current_region(gaze_point.screen_x, gaze_point.screen_y,
+                                                              gaze_point.timestamp)
+                else:
+                    self.region_manager.set_current_region(current_region, gaze_point.timestamp)
                 new_region = self.region_manager.get_current_region()
                 
                 # 发出区域变化信号
-                if old_region != new_region:
+                if old_region is not new_region:
                     if old_region:
                         self.region_exited.emit(old_region)
                     if new_region:
@@ -107,55 +205,88 @@ class RegionGridWidget(QWidget):
             
             self.update()
     
+    def update_scaled_rects(self):
+        """预先计算缩放到组件大小的区域矩形和标签位置，仅在尺寸或区域布局变化时重新计算"""
+        rm = self.region_manager
+        self._layout_version = rm.layout_version
+        self._scale_x = self.width() / rm.screen_width
+        self._scale_y = self.height() / rm.screen_height
+        
+        x = rm.xs * self._scale_x
+        y = rm.ys * self._scale_y
+        w = rm.ws * self._scale_x
+        h = rm.hs * self._scale_y
+        self._scaled_rects = np.column_stack([x, y, w, h]).astype(np.int32)
+        self._label_pos = np.column_stack([x + w / 2 - 30, y + h / 2]).astype(np.int32)
+        # 静态背景在下次绘制时重新生成
+        self._static_background = None
+        
+    def render_static_background(self) -> QPixmap:
+        """将所有区域（普通样式）及标签绘制到离屏 pixmap，仅在尺寸或区域变化后重绘"""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # 同一样式的矩形一次性绘制
+        painter.setBrush(self._normal_brush)
+        painter.setPen(self._normal_pen)
+        painter.drawRects([QRect(*rect) for rect in self._scaled_rects.tolist()])
+        
+        painter.setPen(self._label_pen)
+        for name, (label_x, label_y) in zip(self.region_manager.names, self._label_pos.tolist()):
+            painter.drawText(label_x, label_y, name)
+        painter.end()
+        
+        return pixmap
+        
+    def resizeEvent(self, event):
+        """尺寸变化时更新缓存的矩形"""
+        super().resizeEvent(event)
+        self.update_scaled_rects()
+    
     def paintEvent(self, event):
         """绘制区域网格"""
         super().paintEvent(event)
         
+        # 区域布局已被 set_regions 替换时重建缓存的矩形
+        if self._layout_version != self.region_manager.layout_version:
+            self.update_scaled_rects()
+        if self._static_background is None:
+            self._static_background = self.render_static_background()
+        
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # 绘制区域网格
-        regions = self.region_manager.get_regions()
-        current_region = self.region_manager.get_current_region()
+        # 绘制区域网格（缓存的静态背景）
+        painter.drawPixmap(0, 0, self._static_background)
         
-        for region in regions:
-            # 缩放坐标到组件大小
-            scale_x = self.width() / self.region_manager.screen_width
-            scale_y = self.height() / self.region_manager.screen_height
-            
-            x = region['x'] * scale_x
-            y = region['y'] * scale_y
-            width = region['width'] * scale_x
-            height = region['height'] * scale_y
-            
-            # 设置颜色
-            if current_region and region['id'] == current_region['id']:
-                # 当前区域高亮
-                brush = QBrush(QColor(0, 123, 255, 100))
-                pen = QPen(QColor(0, 123, 255), 3)
-            else:
-                # 普通区域
-                brush = QBrush(QColor(240, 240, 240, 50))
-                pen = QPen(QColor(200, 200, 200), 1)
+        # 当前区域高亮
+        current_region = self.region_manager.get_current_region()
+        # 切换布局前排队的视线信号可能带来旧布局的区域，超出范围时不高亮
+        if current_region and current_region['id'] < len(self._scaled_rects):
+            idx = current_region['id']
+            x, y, width, height = self._scaled_rects[idx].tolist()
+            label_x, label_y = self._label_pos[idx].tolist()
             
-            painter.setBrush(brush)
-            painter.setPen(pen)
-            painter.drawRect(int(x), int(y), int(width), int(height))
+            painter.setBrush(self._current_brush)
+            painter.setPen(self._current_pen)
+            painter.drawRect(x, y, width, height)
             
-            # 绘制区域标签
-            painter.setPen(QPen(QColor(100, 100, 100)))
-            painter.drawText(int(x + width/2 - 30), int(y + height/2), region['name'])
+            # 高亮层覆盖了标签，重新绘制
+            painter.setPen(self._label_pen)
+            painter.drawText(label_x, label_y, current_region['name'])
         
         # 绘制视线点
         if self.current_gaze_point:
-            scale_x = self.width() / self.region_manager.screen_width
-            scale_y = self.height() / self.region_manager.screen_height
-            
-            gaze_x = self.current_gaze_point.screen_x * scale_x
-            gaze_y = self.current_gaze_point.screen_y * scale_y
+            gaze_x = self.current_gaze_point.screen_x * self._scale_x
+            gaze_y = self.current_gaze_point.screen_y * self._scale_y
             
-            painter.setBrush(QBrush(QColor(255, 0, 0)))
-            painter.setPen(QPen(QColor(255, 0, 0), 2))
+            painter.setBrush(self._gaze_brush)
+            painter.setPen(self._gaze_pen)
             painter.drawEllipse(int(gaze_x - 8), int(gaze_y - 8), 16, 16)
 
 class StatusWidget(CardWidget):
@@ -192,24 +323,32 @@ class StatusWidget(CardWidget):
         
         self.setLayout(layout)
         
+        # 消息先入队，最多每 100ms 批量刷新一次；仅保留最近 100 行
+        self._msg_queue = []
+        self._lines = deque(maxlen=100)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush_messages)
+        
     def add_status_message(self, message: str):
         """添加状态消息"""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-        self.status_text.append(formatted_message)
+        t = time.localtime()
+        self._msg_queue.append(f"[{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}] {message}")
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+            
+    def _flush_messages(self):
+        """将队列中的消息一次性写入文本框"""
+        if not self._msg_queue:
+            return
+        self._lines.extend(self._msg_queue)
+        self._msg_queue.clear()
+        # 按固定长度的行缓冲整体重设内容，无需统计和删除旧段落
+        self.status_text.setPlainText("\n".join(self._lines))
         
         # 保持最新消息可见
-        from PyQt6.QtGui import QTextCursor
         self.status_text.moveCursor(QTextCursor.MoveOperation.End)
-        
-        # 限制消息数量（保留最后100行）
-        document = self.status_text.document()
-        if document.blockCount() > 100:
-            cursor = self.status_text.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.movePosition(QTextCursor.MoveOperation.Down, QTextCursor.MoveMode.KeepAnchor, 10)
-            cursor.removeSelectedText()
 
 class ControlPanelWidget(CardWidget):
     """控制面板组件"""
@@ -271,29 +410,22 @@ class MainWindow(FluentWindow):
     
     def __init__(self):
         super().__init__()
-        self.config = self.load_config()
+        self.config = _load_config()
+        self._window_title = self.config.get('SYSTEM', 'title', fallback='Eye Touch 眼动追踪系统')
         self.eye_tracker = EyeTrackingInterface()
         
-        # 获取屏幕尺寸作为区域管理器的基础尺寸
-        from PyQt6.QtWidgets import QApplication
-        screen = QApplication.primaryScreen()
-        screen_size = screen.geometry()
-        self.region_manager = RegionManager(screen_size.width(), screen_size.height(), 3, 3)  # 全屏尺寸和3x3网格
+        # 获取一次屏幕尺寸，供区域管理器和全屏窗口设置共用
+        self._screen_geom = QApplication.primaryScreen().geometry()
+        self.region_manager = RegionManager(self._screen_geom.width(), self._screen_geom.height(), 3, 3)  # 全屏尺寸和3x3网格
+        self.tracking_worker = TrackingWorker(self.eye_tracker, self.region_manager)
         
         self.init_ui()
         self.init_connections()
-        self.setup_update_timer()
         
-    def load_config(self) -> configparser.ConfigParser:
-        """加载配置文件"""
-        config = configparser.ConfigParser()
-        config.read('config.ini', encoding='utf-8')
-        return config
-    
     def init_ui(self):
         """初始化用户界面"""
         # 设置窗口属性
-        self.setWindowTitle(self.config.get('SYSTEM', 'title', fallback='Eye Touch 眼动追踪系统'))
+        self.setWindowTitle(self._window_title)
         
         # 设置主题
         setTheme(Theme.AUTO)
@@ -309,13 +441,8 @@ class MainWindow(FluentWindow):
     
     def setup_fullscreen_window(self):
         """设置全屏且固定窗口比例"""
-        # 获取屏幕尺寸
-        from PyQt6.QtWidgets import QApplication
-        screen = QApplication.primaryScreen()
-        screen_geometry = screen.geometry()
-        
         # 设置窗口为屏幕尺寸且不可调整
-        self.setFixedSize(screen_geometry.size())
+        self.setFixedSize(self._screen_geom.size())
         self.move(0, 0)  # 移动到屏幕左上角
         
         # 禁用窗口的最大化按钮和调整大小功能
@@ -323,9 +450,6 @@ class MainWindow(FluentWindow):
         if hasattr(self.titleBar, 'maxBtn'):
             self.titleBar.maxBtn.setEnabled(False)
             self.titleBar.maxBtn.setVisible(False)
-        
-        # 禁用窗口调整大小
-        self.setFixedSize(screen_geometry.size())
     
     def create_title_area(self):
         """创建标题区域"""
@@ -354,6 +478,7 @@ class MainWindow(FluentWindow):
         # 创建主内容组件
         content_widget = QWidget()
         content_widget.setObjectName("tracking_page")  # 设置对象名称
+        self.tracking_page = content_widget
         main_layout = QHBoxLayout(content_widget)
         main_layout.setContentsMargins(20, 20, 20, 20)
         main_layout.setSpacing(20)
@@ -422,17 +547,21 @@ class MainWindow(FluentWindow):
         self.region_widget.region_entered.connect(self.on_region_entered)
         self.region_widget.region_exited.connect(self.on_region_exited)
         
-    def setup_update_timer(self):
-        """设置更新定时器"""
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_display)
-        self.update_timer.start(33)  # 30 FPS
+        # 追踪线程推送的视线更新
+        self.tracking_worker.gaze_updated.connect(self.on_gaze_updated)
+        self.tracking_worker.frame_ready.connect(self.on_frame_ready)
+        
+        # 切换页面时记录追踪页是否可见
+        self.stackedWidget.currentChanged.connect(self.on_interface_changed)
+        self.on_interface_changed(self.stackedWidget.currentIndex())
         
     @pyqtSlot()
     def start_tracking(self):
         """开始眼动追踪"""
         if self.eye_tracker.initialize_camera():
-            self.eye_tracker.start_tracking()
+            # 帧处理由 TrackingWorker 驱动
+            self.eye_tracker.start_tracking(background_processing=False)
+            self.tracking_worker.start()
             self.status_widget.add_status_message("✅ 眼动追踪已启动")
         else:
             self.status_widget.add_status_message("❌ 摄像头初始化失败")
@@ -441,9 +570,15 @@ class MainWindow(FluentWindow):
     @pyqtSlot()
     def stop_tracking(self):
         """停止眼动追踪"""
-        self.eye_tracker.stop_tracking()
+        self.shutdown_tracking()
         self.status_widget.add_status_message("⏹️ 眼动追踪已停止")
         
+    def shutdown_tracking(self):
+        """停止处理线程并释放摄像头"""
+        self.tracking_worker.requestInterruption()
+        self.tracking_worker.wait()
+        self.eye_tracker.stop_tracking()
+        
     @pyqtSlot()
     def start_calibration(self):
         """开始校准"""
@@ -466,17 +601,23 @@ class MainWindow(FluentWindow):
         """处理退出区域事件"""
         self.status_widget.add_status_message(f"👋 离开 {region['name']}")
         
-    def update_display(self):
-        """更新显示"""
-        # 更新摄像头画面
-        current_frame = self.eye_tracker.get_current_frame()
-        current_gaze = self.eye_tracker.get_current_gaze_point()
+    @pyqtSlot(object, object)
+    def on_gaze_updated(self, gaze_point: Optional[GazePoint], current_region: Optional[dict]):
+        """处理追踪线程推送的视线更新"""
+        # 更新区域显示
+        self.region_widget.update_gaze_point(gaze_point, current_region)
         
-        if current_frame is not None:
-            self.camera_widget.update_frame(current_frame, current_gaze)
+    @pyqtSlot(int)
+    def on_interface_changed(self, index: int):
+        """页面切换：仅在追踪页可见时准备和推送预览帧"""
+        self.tracking_worker.display_enabled = self.stackedWidget.widget(index) is self.tracking_page
         
-        # 更新区域显示
-        self.region_widget.update_gaze_point(current_gaze)
+    @pyqtSlot(object, object, object)
+    def on_frame_ready(self, q_image: QImage, _bgra: np.ndarray, gaze_point: Optional[GazePoint]):
+        """处理追踪线程推送的新帧"""
+        # 更新摄像头画面
+        self.camera_widget.update_frame(q_image, gaze_point)
+        self.tracking_worker.frame_consumed()
         
     def keyPressEvent(self, event: QKeyEvent):
         """键盘事件处理"""
@@ -488,5 +629,5 @@ class MainWindow(FluentWindow):
     
     def closeEvent(self, event):
         """窗口关闭事件"""
-        self.eye_tracker.stop_tracking()
+        self.shutdown_tracking()
         event.accept()
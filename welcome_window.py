@@ -120,16 +120,18 @@ class WelcomeWindow(FramelessWindow):
         
         # 设置倒计时 - 延长到5秒
         self.countdown = 5
-        self.timer.start(1000)  # 每秒更新一次
+        self._closed = False
+        self.timer.start(1000)  # 每秒更新一次显示
+        # 到时自动关闭，与显示定时器分开调度
+        QTimer.singleShot(self.countdown * 1000, self.close_window)
         
     def update_countdown(self):
-        """更新倒计时"""
+        """更新倒计时显示"""
+        self.countdown -= 1
         if self.countdown > 0:
             self.progress_label.setText(f"系统初始化中... {self.countdown}秒后自动进入")
-            self.countdown -= 1
         else:
             self.timer.stop()
-            self.close_window()
     
     def keyPressEvent(self, event: QKeyEvent):
         """键盘事件处理"""
@@ -155,7 +157,11 @@ class WelcomeWindow(FramelessWindow):
         )
     
     def close_window(self):
-        """关闭窗口"""
+        """关闭窗口（自动关闭与空格跳过可能先后触发，只处理一次）"""
+        if self._closed:
+            return
+        self._closed = True
+        self.timer.stop()
         self.window_closed.emit()
         self.close()
 